@@ -7,12 +7,16 @@ import time
 import logging
 import json
 from datetime import datetime
-from typing import Dict, Optional, List, Tuple, Any
+from typing import Dict, Optional, List, Tuple, Any, Union
 from dataclasses import dataclass, field
 from enum import Enum
 from collections import deque
 
 
+# Upper bound on messages queued for a single agent; the oldest are dropped beyond this
+MAX_PENDING_MESSAGES = 1024
+
+
 class AgentState(Enum):
     """Agent states"""
     IDLE = "idle"
@@ -31,8 +35,9 @@ class AgentStatus:
     last_update: float
     initialization_time: float = field(default_factory=time.time)
     last_activity: Optional[str] = None
-    pending_messages: deque = field(default_factory=deque)
+    pending_messages: deque = field(default_factory=lambda: deque(maxlen=MAX_PENDING_MESSAGES))
     messages_sent_while_busy: int = 0
+    last_content: Optional[str] = None  # Pane capture the current state was detected from
 
 
 @dataclass
@@ -264,6 +269,9 @@ class AnomalyHistory:
 class AgentStateMonitor:
     """Monitors agent states in tmux panes"""
     
+    # Spinner symbols that can start a processing indicator line (see BUSY_PATTERNS)
+    _SPINNER_CHARS = frozenset('·✢✳✶✻✽*')
+    
     # Patterns to detect agent state
     # The busy indicator uses specific spinner symbols followed by a word and ellipsis
     # Spinner symbols from Claude Code: ·, ✢, ✳, ✶, ✻, ✽, *
@@ -313,6 +321,66 @@ class AgentStateMonitor:
         r"Claude Code v\d+\.\d+",
     ]
     
+    # Precompiled forms of the patterns above, with the flags baked in so the
+    # hot detection path never goes through the re module's pattern cache
+    _QUIT_RES = [re.compile(p, re.IGNORECASE) for p in QUIT_PATTERNS]  # Matched line by line
+    # Feedback UI patterns fused into one alternation so filtering is a single pass
+    _FEEDBACK_UI_RE = re.compile('|'.join(f'(?:{p})' for p in FEEDBACK_UI_PATTERNS), re.IGNORECASE)
+    
+    # ERROR and INITIALIZING only ask whether any pattern of the group matches, so each
+    # group is a single alternation scanned in one pass. QUIT stays per pattern because
+    # each pattern's first match is checked for context that follows it.
+    _ERROR_RE = re.compile('|'.join(f'(?:{p})' for p in ERROR_PATTERNS), re.IGNORECASE)
+    _INITIALIZING_RE = re.compile('|'.join(f'(?:{p})' for p in INITIALIZING_PATTERNS), re.IGNORECASE)
+    
+    # Typical bash prompts: user@host:path$, simple $ or root #
+    _BASH_PROMPT_RE = re.compile(r'^(?:\w+@\w+:.*\$|\$|\#)$')
+    
+    # Lowercase substrings that every match of the corresponding case-insensitive
+    # pattern group contains. Checking these first skips the regexes entirely
+    # for the vast majority of captures, which contain none of them.
+    _QUIT_HINTS = ('goodbye!', 'session ended', 'claude exited', '[process', 'process exited with')
+    _ERROR_HINTS = ('error:', 'failed:', 'exception:', 'traceback', 'mcp error', 'cannot connect')
+    _INITIALIZING_HINTS = (
+        'starting claude', 'initializing', 'loading', 'connecting', 'welcome to claude', 'claude code v'
+    )
+    _FEEDBACK_UI_HINTS = ('how is claude doing', 'dismiss', 'thanks for helping make claude better')
+    
+    # Content fingerprint: one bit per hint group present in the recent window. It is
+    # computed once per detection and decides which stages need to run at all, so a
+    # plain idle or busy capture (only the prompt box bit set) goes straight to the
+    # prompt box analysis. The initializing hints are left out, as that stage only
+    # runs for young agents and checks them itself.
+    _FP_QUIT = 1 << 0
+    _FP_ERROR = 1 << 1
+    _FP_FEEDBACK_UI = 1 << 2
+    _FP_PROMPT_BOX = 1 << 3
+    _FINGERPRINT_HINTS = (
+        (_QUIT_HINTS, _FP_QUIT),
+        (_ERROR_HINTS, _FP_ERROR),
+        (_FEEDBACK_UI_HINTS, _FP_FEEDBACK_UI),
+        (('╭',), _FP_PROMPT_BOX),
+    )
+    
+    # Processing words that show an agent is still working after a QUIT-like message
+    _BUSY_WORDS_WITH_ELLIPSIS = ('Accomplishing…', 'Working…', 'Processing…', 'Thinking…', 'Analyzing…')
+    
+    # Complete prompt box (top, prompt line, bottom) anywhere in a block of text
+    _PROMPT_BOX_FULL_RE = re.compile(r'╭.*╮.*\n.*│.*>.*│.*\n.*╰.*╯', re.DOTALL)
+    
+    # Prompt indicator helpers used by ERROR recovery and the fallback check
+    _PROMPT_INDICATOR_RE = re.compile(r'│\s*>')
+    _PROMPT_TEXT_RE = re.compile(r'│\s*>\s*(.+)')
+    _EMPTY_PROMPT_RE = re.compile(r'│\s*>\s*│')
+    
+    # Structural elements for UI anomaly detection (box lines are classified by _classify_line)
+    _SEPARATOR_CHARS = '═━┃┏┓┗┛'
+    _UNEXPECTED_BOX_CHARS_RE = re.compile('[┌┐└┘├┤┬┴┼]')  # Box chars Claude's UI never draws
+    
+    # Pane history captured for state updates. State detection only looks at the last
+    # 20 non-blank lines, so 20 lines of history on top of the visible screen is enough.
+    CAPTURE_HISTORY_LIMIT = -20
+    
     def __init__(self, tmux_manager, anomaly_history_config: Optional[AnomalyHistoryConfig] = None):
         self.tmux = tmux_manager
         self.logger = logging.getLogger(__name__)
@@ -322,14 +390,21 @@ class AgentStateMonitor:
         self.anomaly_history = AnomalyHistory(anomaly_history_config)
         self.anomaly_monitoring_enabled = True
         
-    def detect_agent_state(self, pane_content: str, agent_name: str = None) -> AgentState:
-        """Detect agent state from pane content with initialization handling"""
+    def detect_agent_state(self, pane_content: Union[str, List[str]], agent_name: str = None) -> AgentState:
+        """Detect agent state from pane content with initialization handling
+        
+        pane_content may also be given as the already split lines of a capture.
+        """
         if not pane_content:
             return AgentState.UNKNOWN
             
         # Get lines for analysis
-        lines = pane_content.strip().split('\n')
-        recent_content = '\n'.join(lines[-20:])
+        if isinstance(pane_content, str):
+            lines = pane_content.strip().split('\n')
+        else:
+            lines = self._strip_lines(pane_content)
+        recent_lines = lines[-20:]
+        recent_content = '\n'.join(recent_lines)
         last_few_lines = '\n'.join(lines[-5:])
         
         # Check agent age for initialization detection
@@ -337,51 +412,65 @@ class AgentStateMonitor:
         if agent_name and agent_name in self.agent_states:
             agent_age = time.time() - self.agent_states[agent_name].initialization_time
         
-        # Filter out feedback UI elements before processing
+        # Which hint groups are present decides which of the stages below can match
+        recent_lower = recent_content.lower()
+        fingerprint = self._fingerprint(recent_lower)
+        
+        # Filter out feedback UI elements before processing. The feedback UI is rarely
+        # on screen, so both windows are left as is unless one of its keywords shows up
+        # (the last few lines are part of the recent window, so one check covers both).
         filtered_recent = recent_content
         filtered_last_few = last_few_lines
-        for pattern in self.FEEDBACK_UI_PATTERNS:
-            filtered_recent = re.sub(pattern, '', filtered_recent, flags=re.IGNORECASE)
-            filtered_last_few = re.sub(pattern, '', filtered_last_few, flags=re.IGNORECASE)
+        feedback_removed = 0
+        if fingerprint & self._FP_FEEDBACK_UI:
+            filtered_recent, feedback_removed = self._FEEDBACK_UI_RE.subn('', recent_content)
+            filtered_last_few = self._FEEDBACK_UI_RE.sub('', last_few_lines)
         
         # 1. Check for QUIT first (highest priority) with context checking
-        for pattern in self.QUIT_PATTERNS:
-            match = re.search(pattern, recent_content, re.IGNORECASE | re.MULTILINE)
-            if match:
-                # Check if there's an active prompt box AFTER the quit pattern
-                match_pos = match.start()
-                after_match = recent_content[match_pos:]
-                
-                # If we see an active prompt box after, agent hasn't quit
-                if re.search(r'╭.*╮.*\n.*│.*>.*│.*\n.*╰.*╯', after_match, re.DOTALL):
-                    continue
-                    
-                # If we see processing indicators after, agent hasn't quit
-                if any(re.search(f'{word}…', after_match) for word in [
-                    'Accomplishing', 'Working', 'Processing', 'Thinking', 'Analyzing'
-                ]):
-                    continue
+        # QUIT patterns never span lines, so each pattern's first match is found line by
+        # line and the text after it is only joined up when there is a match
+        if fingerprint & self._FP_QUIT:
+            for pattern in self._QUIT_RES:
+                match = None
+                for match_line, line in enumerate(recent_lines):
+                    match = pattern.search(line)
+                    if match:
+                        break
+                if match:
+                    # Check if there's an active prompt box AFTER the quit pattern
+                    after_match = '\n'.join(
+                        [line[match.start():]] + recent_lines[match_line + 1:]
+                    )
                     
-                return AgentState.QUIT
+                    # If we see an active prompt box after, agent hasn't quit
+                    if self._has_full_prompt_box(after_match):
+                        continue
+                        
+                    # If we see processing indicators after, agent hasn't quit
+                    if any(word in after_match for word in self._BUSY_WORDS_WITH_ELLIPSIS):
+                        continue
+                        
+                    return AgentState.QUIT
         
         # 2. Check for ERROR (but not if there's a prompt after)
-        for pattern in self.ERROR_PATTERNS:
-            if re.search(pattern, filtered_last_few, re.IGNORECASE):
-                # If there's a prompt box after error, agent recovered
-                if not re.search(r'│\s*>', filtered_last_few):
-                    return AgentState.ERROR
+        # Unfiltered, the last few lines are a suffix of the fingerprinted window
+        if ((fingerprint & self._FP_ERROR or feedback_removed)
+                and self._ERROR_RE.search(filtered_last_few)):
+            # If there's a prompt box after error, agent recovered
+            if not self._PROMPT_INDICATOR_RE.search(filtered_last_few):
+                return AgentState.ERROR
         
         # 3. Check for INITIALIZING (during first 3 seconds or if we see init patterns)
         if agent_age is not None and agent_age < 3:
             # Only consider initializing if we see actual init patterns or just bash prompts
-            for pattern in self.INITIALIZING_PATTERNS:
-                if re.search(pattern, recent_content, re.IGNORECASE):
-                    # But if we see a prompt box, agent has initialized
-                    if not re.search(r'╭.*╮.*\n.*│.*>.*│.*\n.*╰.*╯', recent_content, re.DOTALL):
-                        return AgentState.INITIALIZING
+            if (any(hint in recent_lower for hint in self._INITIALIZING_HINTS)
+                    and self._INITIALIZING_RE.search(recent_content)):
+                # But if we see a prompt box, agent has initialized
+                if not self._has_full_prompt_box(recent_content):
+                    return AgentState.INITIALIZING
             
             # If agent is young and we only see bash prompts, it's probably initializing
-            if self._contains_only_bash_prompts(recent_content):
+            if self._contains_only_bash_prompts(recent_lines):
                 return AgentState.INITIALIZING
         
         # 4. Check for BUSY state by looking for processing indicator
@@ -391,21 +480,24 @@ class AgentStateMonitor:
         # - Empty line
         # - Prompt box (╭─...─╮, │ > ... │, ╰─...─╯)
         
-        lines = filtered_recent.split('\n')
+        # Only re-split when the feedback filter actually changed the content
+        lines = filtered_recent.split('\n') if feedback_removed else recent_lines
         
         # Find the prompt box top line (╭────────────────────────╮)
-        # We need to find the LAST prompt box, as there might be welcome boxes above
+        # We need to find the LAST prompt box, as there might be welcome boxes above,
+        # so scan from the bottom and stop at the first input box found
         prompt_box_top = -1
-        for i, line in enumerate(lines):
-            if '╭' in line and '╮' in line and '─' in line:
-                # Check if this is likely an input prompt box by looking for '>' in next few lines
-                is_input_box = False
-                for j in range(i + 1, min(i + 4, len(lines))):
-                    if '│' in lines[j] and '>' in lines[j]:
-                        is_input_box = True
+        if fingerprint & self._FP_PROMPT_BOX:
+            for i in range(len(lines) - 1, -1, -1):
+                line = lines[i]
+                if '╭' in line and '╮' in line and '─' in line:
+                    # Check if this is likely an input prompt box by looking for '>' in next few lines
+                    for j in range(i + 1, min(i + 4, len(lines))):
+                        if self._has_prompt_marker(lines[j]):
+                            prompt_box_top = i
+                            break
+                    if prompt_box_top >= 0:
                         break
-                if is_input_box:
-                    prompt_box_top = i
         
         if prompt_box_top >= 0:
             # We found the prompt box
@@ -426,12 +518,9 @@ class AgentStateMonitor:
                     for check_idx in range(max(0, prompt_box_top - 5), prompt_box_top - 1):
                         # Strip line before checking to handle leading spaces from snapshot formatting
                         line_to_check = lines[check_idx].strip()
-                        for pattern in self.BUSY_PATTERNS:
-                            if re.search(pattern, line_to_check, re.IGNORECASE):
-                                found_indicator = True
-                                indicator_line = check_idx
-                                break
-                        if found_indicator:
+                        if self._is_processing_indicator(line_to_check):
+                            found_indicator = True
+                            indicator_line = check_idx
                             break
                     
                     if found_indicator:
@@ -477,11 +566,14 @@ class AgentStateMonitor:
                 # Check all lines between top and bottom of box
                 has_text = False
                 for i in range(prompt_box_top + 1, prompt_box_bottom):
-                    if '│' in lines[i] and '>' in lines[i]:
-                        # This is the prompt line, check for text after >
-                        match = re.search(r'>\s*(.*)(?=\s*│)', lines[i])
-                        if match and match.group(1).strip():
-                            text = match.group(1).strip()
+                    left_border = lines[i].find('│')
+                    prompt = lines[i].find('>', left_border) if left_border != -1 else -1
+                    if prompt != -1:
+                        # This is the prompt line, check for text between > and the closing border
+                        after_prompt = lines[i][prompt + 1:]
+                        border = after_prompt.rfind('│')
+                        text = after_prompt[:border].strip() if border >= 0 else ''
+                        if text:
                             # TODO: This is a temporary fix. Better solution would be to detect cursor position
                             # or text color to distinguish Claude's grayed-out suggestions from actual user input
                             # Skip Claude's startup suggestions
@@ -489,19 +581,20 @@ class AgentStateMonitor:
                                 continue
                             has_text = True
                             break
-                    elif '│' in lines[i]:
-                        # Continuation line, check if it has content
-                        match = re.search(r'│\s*([^│]+)\s*│', lines[i])
-                        if match and match.group(1).strip():
+                    elif left_border != -1:
+                        # Continuation line, check if the first non-empty cell between borders has content
+                        cells = lines[i].split('│')[1:-1]
+                        cell = next((c for c in cells if c), '')
+                        if cell.strip():
                             has_text = True
                             break
                 
                 return AgentState.WRITING if has_text else AgentState.IDLE
         
         # 6. Fallback: look for any prompt indicator
-        if '│' in filtered_last_few and '>' in filtered_last_few:
+        if self._has_prompt_marker(filtered_last_few):
             # Check for text after prompt
-            prompt_match = re.search(r'│\s*>\s*(.+)', filtered_last_few)
+            prompt_match = self._PROMPT_TEXT_RE.search(filtered_last_few)
             if prompt_match and prompt_match.group(1).strip():
                 text = prompt_match.group(1).strip()
                 # TODO: Same temporary fix as above - skip Claude's suggestions
@@ -509,13 +602,65 @@ class AgentStateMonitor:
                     return AgentState.WRITING
             # Only return IDLE if we clearly see an empty prompt box
             # Otherwise return UNKNOWN
-            if re.search(r'│\s*>\s*│', filtered_last_few):
+            if self._EMPTY_PROMPT_RE.search(filtered_last_few):
                 return AgentState.IDLE
         
         # 7. If we can't determine the state clearly, return UNKNOWN
         # Don't make assumptions during initialization
         return AgentState.UNKNOWN
     
+    @classmethod
+    def _fingerprint(cls, text_lower: str) -> int:
+        """Bitmask of the hint groups (_FP_* bits) present in lowercased text"""
+        fingerprint = 0
+        for hints, bit in cls._FINGERPRINT_HINTS:
+            if any(hint in text_lower for hint in hints):
+                fingerprint |= bit
+        return fingerprint
+    
+    @staticmethod
+    def _has_prompt_marker(text: str) -> bool:
+        """Check for a prompt marker, i.e. a '>' somewhere after the first '│'"""
+        border = text.find('│')
+        return border != -1 and text.find('>', border) != -1
+    
+    @classmethod
+    def _has_full_prompt_box(cls, text: str) -> bool:
+        """Check for a complete prompt box, skipping the regex when a box part is missing"""
+        return ('╭' in text and '╰' in text and '>' in text
+                and cls._PROMPT_BOX_FULL_RE.search(text) is not None)
+    
+    @classmethod
+    def _is_processing_indicator(cls, line: str) -> bool:
+        """
+        Check whether a stripped line is a processing indicator.
+        Same shape as BUSY_PATTERNS (spinner, whitespace, word, ellipsis), checked
+        with a set lookup and str methods instead of the regex engine.
+        """
+        if not line or line[0] not in cls._SPINNER_CHARS:
+            return False
+        rest = line[1:]
+        word = rest.lstrip()
+        if len(word) == len(rest):
+            return False  # Spinner must be followed by whitespace
+        head, sep, _ = word.partition('…')
+        # The word is one or more \w characters (alphanumerics or underscore)
+        return bool(sep) and bool(head) and head.replace('_', 'a').isalnum()
+    
+    @staticmethod
+    def _classify_line(line: str) -> Optional[str]:
+        """
+        Classify a line as part of a box without the regex engine.
+        Returns: 'top' (╭──╮), 'middle' (│..│), 'bottom' (╰──╯) or None
+        """
+        if line.startswith('╭─'):
+            return 'top' if line[1:].lstrip('─').startswith('╮') else None
+        if line.startswith('╰─'):
+            return 'bottom' if line[1:].lstrip('─').startswith('╯') else None
+        if line.startswith('│') and line.find('│', 1) != -1:
+            return 'middle'
+        return None
+    
     def _classify_box_type(self, lines: List[str], box: dict) -> str:
         """
         Classify a box based on its content.
@@ -537,7 +682,7 @@ class AgentStateMonitor:
         # Classification rules
         if 'Welcome to Claude Code' in full_content:
             return 'welcome'
-        elif re.search(r'^\s*>\s*', full_content):
+        elif full_content.lstrip().startswith('>'):
             # Any input box with > prompt (includes empty prompt, commands, and typing)
             return 'input'
         elif 'MESSAGE' in full_content or 'message' in full_content:
@@ -557,36 +702,31 @@ class AgentStateMonitor:
         else:
             return 'unknown'
     
-    def detect_ui_anomalies(self, pane_content: str) -> list:
+    def detect_ui_anomalies(self, pane_content: Union[str, List[str]]) -> list:
         """
         Detect structural anomalies in UI layout.
         Focuses on UI structure, not content.
+        pane_content may also be given as the already split lines of a capture.
         Returns list of anomalies found.
         """
         anomalies = []
-        lines = pane_content.split('\n')
-        
-        # Structural patterns
-        PROMPT_BOX_TOP = r'╭[─]+╮'
-        PROMPT_BOX_MIDDLE = r'│.*│'
-        PROMPT_BOX_BOTTOM = r'╰[─]+╯'
-        SHORTCUTS_LINE = r'\? for shortcuts'
-        PERMISSIONS_LINE = r'Bypassing Permissions'
+        lines = pane_content.split('\n') if isinstance(pane_content, str) else pane_content
         
         # Find all prompt boxes
         prompt_boxes = []
         i = 0
         while i < len(lines):
-            if re.match(PROMPT_BOX_TOP, lines[i]):
+            if self._classify_line(lines[i]) == 'top':
                 box = {'top': i, 'middle': [], 'bottom': None, 'type': None}
                 i += 1
                 
                 # Find middle and bottom
                 while i < len(lines) and i < box['top'] + 10:  # Reasonable box size limit
-                    if re.match(PROMPT_BOX_MIDDLE, lines[i]):
+                    line_kind = self._classify_line(lines[i])
+                    if line_kind == 'middle':
                         box['middle'].append(i)
                         i += 1
-                    elif re.match(PROMPT_BOX_BOTTOM, lines[i]):
+                    elif line_kind == 'bottom':
                         box['bottom'] = i
                         break
                     else:
@@ -689,7 +829,7 @@ class AgentStateMonitor:
                 continue
             
             # Check for unusual separators
-            if re.match(r'^[═━┃┏┓┗┛]+$', line) and len(line) > 10:
+            if len(line) > 10 and not line.strip(self._SEPARATOR_CHARS):
                 anomalies.append({
                     'line_num': i,
                     'content': line,
@@ -697,8 +837,7 @@ class AgentStateMonitor:
                 })
             
             # Check for box chars outside expected areas
-            unexpected_box_chars = ['┌', '┐', '└', '┘', '├', '┤', '┬', '┴', '┼']
-            if any(char in line for char in unexpected_box_chars):
+            if self._UNEXPECTED_BOX_CHARS_RE.search(line):
                 anomalies.append({
                     'line_num': i,
                     'content': line,
@@ -712,35 +851,56 @@ class AgentStateMonitor:
         
         return anomalies
     
-    def _contains_only_bash_prompts(self, content: str) -> bool:
-        """Check if content contains only bash prompts (no Claude UI)"""
-        lines = content.strip().split('\n')
-        non_empty_lines = [line for line in lines if line.strip()]
+    @staticmethod
+    def _strip_lines(lines: List[str]) -> List[str]:
+        """Equivalent of '\\n'.join(lines).strip().split('\\n') without joining"""
+        start, end = 0, len(lines)
+        while start < end and not lines[start].strip():
+            start += 1
+        while end > start and not lines[end - 1].strip():
+            end -= 1
+        if start == end:
+            return ['']
+        stripped = lines[start:end]
+        stripped[0] = stripped[0].lstrip()
+        stripped[-1] = stripped[-1].rstrip()
+        return stripped
+    
+    def _contains_only_bash_prompts(self, lines: List[str]) -> bool:
+        """Check if lines contain only bash prompts (no Claude UI)"""
+        # Stripped once here, both for the emptiness test and the prompt match
+        non_empty_lines = [stripped for stripped in (line.strip() for line in lines) if stripped]
         
         if not non_empty_lines:
             return True
             
         # Look for typical bash prompt patterns
-        bash_patterns = [
-            r'^\w+@\w+:.*\$$',  # user@host:path$
-            r'^\$$',             # simple $
-            r'^\#$',             # root #
-        ]
-        
         bash_line_count = 0
         for line in non_empty_lines[-3:]:  # Check last 3 non-empty lines
-            for pattern in bash_patterns:
-                if re.match(pattern, line.strip()):
-                    bash_line_count += 1
-                    break
+            if self._BASH_PROMPT_RE.match(line):
+                bash_line_count += 1
         
         # If most recent lines are bash prompts, assume bash-only
         return bash_line_count >= min(2, len(non_empty_lines[-3:]))
         
     def update_agent_state(self, agent_name: str, pane_index: int) -> AgentState:
         """Update and return agent state"""
-        # Capture pane content
-        content = self.tmux.capture_pane(pane_index, history_limit=-50)
+        content = self.tmux.capture_pane(pane_index, history_limit=self.CAPTURE_HISTORY_LIMIT)
+        return self._update_agent_state_from_content(agent_name, content)
+        
+    def update_all_agents(self, agents: Dict[str, int]) -> Dict[str, AgentState]:
+        """Update and return states of several agents (name -> pane index)
+        
+        All panes are captured with a single tmux invocation instead of one per agent.
+        """
+        contents = self.tmux.capture_panes(list(agents.values()), history_limit=self.CAPTURE_HISTORY_LIMIT)
+        return {
+            agent_name: self._update_agent_state_from_content(agent_name, contents.get(pane_index))
+            for agent_name, pane_index in agents.items()
+        }
+        
+    def _update_agent_state_from_content(self, agent_name: str, content: Optional[str]) -> AgentState:
+        """Update and return agent state from a pane capture"""
         if not content:
             self.logger.warning(f"Could not capture pane for {agent_name}")
             return AgentState.UNKNOWN
@@ -748,8 +908,17 @@ class AgentStateMonitor:
         # Debug: log content length
         self.logger.debug(f"Captured {len(content)} chars from {agent_name} pane")
         
+        # Pane unchanged since the last detection, so the detected state still holds
+        status = self.agent_states.get(agent_name)
+        if status is not None and status.last_content == content:
+            status.last_update = time.time()
+            return status.state
+        
+        # Split once and share the lines between anomaly and state detection
+        lines = content.split('\n')
+        
         # Detect UI anomalies first
-        anomalies = self.detect_ui_anomalies(content)
+        anomalies = self.detect_ui_anomalies(lines)
         if anomalies:
             self.logger.debug(f"UI anomalies detected for {agent_name}: {len(anomalies)} anomaly(ies)")
             # Log first few anomalies for debugging
@@ -759,7 +928,7 @@ class AgentStateMonitor:
                 )
         
         # Detect state
-        state = self.detect_agent_state(content, agent_name)
+        state = self.detect_agent_state(lines, agent_name)
         
         # Extra warning if state is UNKNOWN with anomalies
         if anomalies and state == AgentState.UNKNOWN:
@@ -784,6 +953,11 @@ class AgentStateMonitor:
             
             self.agent_states[agent_name].state = state
             self.agent_states[agent_name].last_update = current_time
+            # Only INITIALIZING depends on agent age rather than pane content alone,
+            # so any other result can be reused while the pane stays the same
+            self.agent_states[agent_name].last_content = (
+                content if state != AgentState.INITIALIZING else None
+            )
             
             # Log state changes
             if old_state != state:
@@ -815,7 +989,12 @@ class AgentStateMonitor:
                 last_update=time.time()
             )
             
-        self.agent_states[agent_name].pending_messages.append(message)
+        pending = self.agent_states[agent_name].pending_messages
+        if len(pending) == pending.maxlen:
+            self.logger.warning(
+                f"Pending message queue for {agent_name} is full ({pending.maxlen}), dropping oldest message"
+            )
+        pending.append(message)
         self.agent_states[agent_name].messages_sent_while_busy += 1
         self.logger.info(f"Queued message for {agent_name} (total: {len(self.agent_states[agent_name].pending_messages)})")
         
@@ -824,10 +1003,12 @@ class AgentStateMonitor:
         if agent_name not in self.agent_states:
             return []
             
-        messages = list(self.agent_states[agent_name].pending_messages)
-        self.agent_states[agent_name].pending_messages.clear()
-        self.agent_states[agent_name].messages_sent_while_busy = 0
-        return messages
+        # Swap in a fresh queue instead of copying and then clearing the old one
+        status = self.agent_states[agent_name]
+        messages = status.pending_messages
+        status.pending_messages = deque(maxlen=messages.maxlen)
+        status.messages_sent_while_busy = 0
+        return list(messages)
         
     def has_pending_messages(self, agent_name: str) -> bool:
         """Check if agent has pending messages"""
@@ -191,9 +191,12 @@ class EnhancedOrchestrator(Orchestrator):
                 if iteration % 20 == 1:  # Log every 20 iterations
                     self.logger.debug(f"Monitor loop iteration {iteration}")
                     
-                # Update all agent states
+                # Update all agent states (all panes captured in one tmux call)
+                agent_states = self.state_monitor.update_all_agents(
+                    {agent_name: agent.pane_index for agent_name, agent in self.agents.items()}
+                )
                 for agent_name, agent in self.agents.items():
-                    state = self.state_monitor.update_agent_state(agent_name, agent.pane_index)
+                    state = agent_states.get(agent_name)
                     
                     # Track state changes and update pane indicators
                     if state and previous_states.get(agent_name) != state.value:
@@ -216,8 +219,8 @@ class EnhancedOrchestrator(Orchestrator):
                 if self.message_delivery:
                     self.message_delivery.check_and_deliver_pending_messages()
                 
-                # Update status bar with current states
-                states = self.get_all_agent_states()
+                # Update status bar with the states just detected
+                states = {agent_name: state.value for agent_name, state in agent_states.items()}
                 if states:
                     self.tmux.update_status_bar(states)
                     
@@ -26,6 +26,9 @@ class TmuxPane:
 class TmuxManager:
     """Manages tmux sessions and panes for agents"""
     
+    # Printed after each pane when several panes are captured in one tmux invocation
+    PANE_CAPTURE_SEPARATOR = "__ccorc_pane_capture_end__"
+    
     def __init__(self, session_name: str = "claude-agents"):
         self.session_name = session_name
         self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
@@ -530,6 +533,43 @@ class TmuxManager:
             self.logger.error(f"Failed to capture pane {pane_index}: {e}")
             return None
             
+    def capture_panes(self, pane_indices: List[int], history_limit: int = 0) -> Dict[int, Optional[str]]:
+        """Capture current content of several panes with a single tmux invocation
+        
+        Args:
+            pane_indices: Indices of the panes to capture
+            history_limit: Number of lines to capture from history (0 = visible only, -1 = all)
+            
+        Returns:
+            Mapping of pane index to captured content (None if it could not be captured)
+        """
+        if not pane_indices:
+            return {}
+            
+        # Chain one capture-pane per pane, each followed by a separator line
+        cmd = ["tmux"]
+        for pane_index in pane_indices:
+            target = f"{self.session_name}:0.{pane_index}"
+            if len(cmd) > 1:
+                cmd.append(";")
+            cmd.extend(["capture-pane", "-t", target, "-p"])
+            if history_limit != 0:
+                cmd.extend(["-S", str(history_limit)])
+            cmd.extend([";", "display-message", "-t", target, "-p", self.PANE_CAPTURE_SEPARATOR])
+            
+        try:
+            result = self._run_command(cmd, capture_output=True, text=True)
+        except subprocess.CalledProcessError as e:
+            # tmux stops at the first failing pane, so capture them one by one instead
+            self.logger.debug(f"Batched pane capture failed, capturing panes individually: {e}")
+            return {pane_index: self.capture_pane(pane_index, history_limit) for pane_index in pane_indices}
+            
+        outputs = result.stdout.split(self.PANE_CAPTURE_SEPARATOR + "\n")
+        return {
+            pane_index: outputs[i] if i < len(outputs) - 1 else None
+            for i, pane_index in enumerate(pane_indices)
+        }
+            
     def list_panes(self) -> List[TmuxPane]:
         """List all panes in session"""
         try:
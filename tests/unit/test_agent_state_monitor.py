@@ -23,7 +23,7 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from src.agent_state_monitor import (
-    AgentStateMonitor, AgentState, AgentStatus
+    AgentStateMonitor, AgentState, AgentStatus, MAX_PENDING_MESSAGES
 )
 
 
@@ -129,6 +129,39 @@ Process terminated with exit code 0
         # Since the simple "│ > │" pattern is detected as WRITING, not IDLE, the transition is writing -> busy
         mock_log.assert_called_with("Agent TestAgent state changed: writing -> busy")
         
+    def test_update_agent_state_skips_detection_for_unchanged_pane(self):
+        """Test that unchanged pane content reuses the previously detected state"""
+        self._set_agent_as_initialized()
+        self.mock_tmux.capture_pane.return_value = "╭────╮\n│ > │\n╰────╯"
+        self.assertEqual(self.monitor.update_agent_state("TestAgent", 0), AgentState.IDLE)
+        
+        with patch.object(self.monitor, 'detect_agent_state') as mock_detect, \
+             patch.object(self.monitor, 'detect_ui_anomalies') as mock_anomalies:
+            state = self.monitor.update_agent_state("TestAgent", 0)
+        
+        self.assertEqual(state, AgentState.IDLE)
+        mock_detect.assert_not_called()
+        mock_anomalies.assert_not_called()
+        
+        # Changed content is detected again
+        self.mock_tmux.capture_pane.return_value = "· Processing… (1s)\n\n╭────╮\n│ > │\n╰────╯"
+        self.assertEqual(self.monitor.update_agent_state("TestAgent", 0), AgentState.BUSY)
+        
+    def test_update_all_agents_uses_single_capture(self):
+        """Test that all agents are updated from one batched pane capture"""
+        self._set_agent_as_initialized("Agent1")
+        self._set_agent_as_initialized("Agent2")
+        self.mock_tmux.capture_panes.return_value = {
+            0: "╭────╮\n│ > │\n╰────╯",
+            1: "· Processing… (1s)\n\n╭────╮\n│ > │\n╰────╯",
+        }
+        
+        states = self.monitor.update_all_agents({"Agent1": 0, "Agent2": 1})
+        
+        self.assertEqual(states, {"Agent1": AgentState.IDLE, "Agent2": AgentState.BUSY})
+        self.mock_tmux.capture_panes.assert_called_once_with([0, 1], history_limit=-20)
+        self.mock_tmux.capture_pane.assert_not_called()
+        
     def test_is_agent_busy(self):
         """Test busy state checking"""
         # Agent not registered
@@ -151,6 +184,20 @@ Process terminated with exit code 0
         self.assertEqual(len(self.monitor.agent_states["TestAgent"].pending_messages), 1)
         self.assertEqual(self.monitor.agent_states["TestAgent"].messages_sent_while_busy, 1)
         
+    def test_queue_message_drops_oldest_when_full(self):
+        """Test that the pending message queue is bounded"""
+        for i in range(MAX_PENDING_MESSAGES):
+            self.monitor.queue_message_for_agent("TestAgent", {"content": f"Message {i}"})
+        
+        with patch.object(self.monitor.logger, 'warning') as mock_warning:
+            self.monitor.queue_message_for_agent("TestAgent", {"content": "Overflow"})
+        
+        pending = self.monitor.agent_states["TestAgent"].pending_messages
+        self.assertEqual(len(pending), MAX_PENDING_MESSAGES)
+        self.assertEqual(pending[0], {"content": "Message 1"})
+        self.assertEqual(pending[-1], {"content": "Overflow"})
+        mock_warning.assert_called_once()
+        
     def test_get_pending_messages_clears_queue(self):
         """Test that getting pending messages clears the queue"""
         message1 = {"from": "Sender1", "content": "Message 1"}
@@ -338,6 +385,18 @@ Just text
         self.assertNotEqual(state, AgentState.BUSY, 
                            "Should NOT detect BUSY without empty line between indicator and prompt")
     
+    def test_prompt_marker_must_follow_border(self):
+        """Test that a '>' before the box border is not taken as the prompt"""
+        self._set_agent_as_initialized()
+        pane_content = """
+╭────────────────────────────────────────╮
+> quoted output                          │
+╰────────────────────────────────────────╯
+"""
+        state = self.monitor.detect_agent_state(pane_content, "TestAgent")
+        self.assertEqual(state, AgentState.UNKNOWN,
+                        "Only a '>' after the left border marks the prompt line")
+    
     def test_multiline_user_input(self):
         """Test detection of multiline user input as WRITING"""
         self._set_agent_as_initialized()
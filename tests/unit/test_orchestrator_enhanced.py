@@ -241,7 +241,7 @@ class TestEnhancedOrchestrator(unittest.TestCase):
         loop_thread.join(timeout=1)
         
         # Check that state was updated
-        self.orchestrator.state_monitor.update_agent_state.assert_called()
+        self.orchestrator.state_monitor.update_all_agents.assert_called_with({"Agent1": 0})
         self.orchestrator.message_delivery.check_and_deliver_pending_messages.assert_called()
         
     def test_state_monitor_loop_handles_exceptions(self):
@@ -252,7 +252,7 @@ class TestEnhancedOrchestrator(unittest.TestCase):
         
         # Mock to raise exception
         self.orchestrator.state_monitor = MagicMock()
-        self.orchestrator.state_monitor.update_agent_state.side_effect = Exception("Test error")
+        self.orchestrator.state_monitor.update_all_agents.side_effect = Exception("Test error")
         self.orchestrator.message_delivery = MagicMock()
         
         # Run loop briefly
@@ -265,7 +265,7 @@ class TestEnhancedOrchestrator(unittest.TestCase):
         loop_thread.join(timeout=1)
         
         # Should have called update multiple times despite exceptions
-        self.assertGreater(self.orchestrator.state_monitor.update_agent_state.call_count, 1)
+        self.assertGreater(self.orchestrator.state_monitor.update_all_agents.call_count, 1)
 
 
 if __name__ == '__main__':
@@ -102,6 +102,41 @@ class TestTmuxManager(unittest.TestCase):
             check=True, capture_output=True, text=True
         )
         
+    @patch('subprocess.run')
+    def test_capture_panes_single_invocation(self, mock_run):
+        """Test that several panes are captured with one tmux call"""
+        sep = TmuxManager.PANE_CAPTURE_SEPARATOR
+        mock_run.return_value = MagicMock(
+            returncode=0,
+            stdout=f"pane zero\n{sep}\npane one\n\n{sep}\n"
+        )
+        
+        result = self.tmux_manager.capture_panes([0, 1], history_limit=-20)
+        
+        self.assertEqual(result, {0: "pane zero\n", 1: "pane one\n\n"})
+        mock_run.assert_called_once_with(
+            ["tmux",
+             "capture-pane", "-t", "test-session:0.0", "-p", "-S", "-20",
+             ";", "display-message", "-t", "test-session:0.0", "-p", sep,
+             ";", "capture-pane", "-t", "test-session:0.1", "-p", "-S", "-20",
+             ";", "display-message", "-t", "test-session:0.1", "-p", sep],
+            check=True, capture_output=True, text=True
+        )
+        
+    @patch('subprocess.run')
+    def test_capture_panes_falls_back_to_individual_captures(self, mock_run):
+        """Test that a failing batch is retried pane by pane"""
+        mock_run.side_effect = [
+            subprocess.CalledProcessError(1, "tmux"),
+            MagicMock(returncode=0, stdout="pane zero\n"),
+            subprocess.CalledProcessError(1, "tmux"),
+        ]
+        
+        result = self.tmux_manager.capture_panes([0, 5])
+        
+        self.assertEqual(result, {0: "pane zero\n", 5: None})
+        self.assertEqual(mock_run.call_count, 3)
+        
     @patch('subprocess.run')
     def test_list_panes_success(self, mock_run):
         """Test successful pane listing"""